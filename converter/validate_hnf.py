@@ -6,11 +6,29 @@ Valida estructura de archivos HNFv9
 v9.0.5: Soporte prefijo text. para consistencia de modalidades
 """
 
+import gc
+import mmap
+import os
 import struct
 import json
 import sys
+import threading
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 # ============================================================================
 # CONSTANTS
 # ============================================================================
@@ -20,6 +38,19 @@ HEADER_SIZE = 64
 BLOCK_TABLE_ENTRY_SIZE = 32
 BLOCK_COUNT = 16
 
+# Formatos precompilados a nivel de módulo: se reutilizan en cada lectura,
+# no deben construirse dentro de read_header/read_block_table
+
+# magic, version_major, version_minor, flags, block_count, header_size,
+# block_table_offset, manifest_offset, manifest_size, file_size, checksum, reserved
+_HEADER = struct.Struct('<8sHHIIIQQQQI4x')
+
+# block_id, block_type, offset, size, checksum
+_BLOCK = struct.Struct('<IIQQQ')
+
+assert _HEADER.size == HEADER_SIZE
+assert _BLOCK.size == BLOCK_TABLE_ENTRY_SIZE
+
 BLOCK_NAMES = [
     "text_model",    # 0x0
     "vision",        # 0x1
@@ -39,25 +70,104 @@ BLOCK_NAMES = [
     "reserved_3",    # 0xF
 ]
 
+# Prefijo esperado por bloque (v9.0.5), en el orden del PREFIX CHECK
+BLOCK_PREFIXES = {
+    "text_model": "text.",
+    "cortex":     "cortex.",
+    "code_exec":  "code.",
+    "vision":     "vision.",
+    "audio":      "audio.",
+}
+BLOCKS_WITH_PREFIX = frozenset(BLOCK_PREFIXES)
+
+TEXT_HINT_FIELDS = ("arch", "num_hidden_layers", "hidden_size", "vocab_size",
+                    "attention_type", "qkv_layout", "mlp_type")
+
+# Secciones de execution_hints: (título, flag, clave, campos, campos de rope_scaling)
+# v9.0.5: TEXT va en sección separada; si falta text_enabled se leen de la raíz
+HINT_SECTIONS = [
+    ("TEXT",   "text_enabled",   "text",          TEXT_HINT_FIELDS, ("type",)),
+    ("VISION", "vision_enabled", "vision_config", ("arch", "image_size", "patch_size"), ()),
+    ("CORTEX", "cortex_enabled", "cortex",
+     ("arch", "num_hidden_layers", "hidden_size", "vocab_size",
+      "qkv_layout", "mlp_type", "partial_rotary_factor"), ("type", "long_factor")),
+    ("CODE",   "code_enabled",   "code",
+     ("arch", "num_hidden_layers", "hidden_size", "vocab_size"), ("type", "factor")),
+]
+
 # ============================================================================
 # READER
 # ============================================================================
 
-def read_header(f):
-    """Lee header HNFv9 (64 bytes)"""
-    data = f.read(64)
+def advise(mm, name, offset=0, size=None):
+    """Aplica madvise(name) sobre [offset, offset+size) si la plataforma lo soporta"""
+    option = getattr(mmap, name, None)
+    if option is None or not hasattr(mm, 'madvise') or offset >= len(mm):
+        return
     
-    magic = data[0:8]
-    version_major = struct.unpack('<H', data[8:10])[0]
-    version_minor = struct.unpack('<H', data[10:12])[0]
-    flags = struct.unpack('<I', data[12:16])[0]
-    block_count = struct.unpack('<I', data[16:20])[0]
-    header_size = struct.unpack('<I', data[20:24])[0]
-    block_table_offset = struct.unpack('<Q', data[24:32])[0]
-    manifest_offset = struct.unpack('<Q', data[32:40])[0]
-    manifest_size = struct.unpack('<Q', data[40:48])[0]
-    file_size = struct.unpack('<Q', data[48:56])[0]
-    checksum = struct.unpack('<I', data[56:60])[0]
+    # madvise exige un inicio alineado a página; size viene del archivo sin
+    # validar, así que se recorta al final del mapeo
+    start = offset - offset % mmap.PAGESIZE
+    length = len(mm) - start
+    if size is not None:
+        length = min(length, size + offset - start)
+    try:
+        mm.madvise(option, start, length)
+    except (OSError, ValueError, OverflowError):
+        pass  # Solo es una pista para el kernel: nunca aborta la validación
+
+def header_crc32(mm):
+    """CRC32 de header + block table, igual que HnfWriter::finalize"""
+    # El writer calcula el CRC antes de rellenar flags, manifest, file_size y checksum
+    data = bytearray(mm[:HEADER_SIZE + BLOCK_COUNT * BLOCK_TABLE_ENTRY_SIZE])
+    data[12:16] = bytes(4)
+    data[32:60] = bytes(28)
+    return zlib.crc32(data)
+
+def block_xxh3(mm, block):
+    """XXH3-64 de los datos de un bloque (requiere xxhash)"""
+    with memoryview(mm)[block['offset']:block['offset'] + block['size']] as data:
+        return xxhash.xxh3_64_intdigest(data)
+
+# Pausas del GC activas (parseos concurrentes en el pool o en otros hilos)
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+@contextmanager
+def gc_paused():
+    """Pausa el GC cíclico mientras dura un parseo JSON"""
+    # El manifest son millones de dicts/listas sin ciclos: el GC solo los
+    # recorre una y otra vez durante el parseo sin liberar nada. El contador
+    # evita que un parseo que termina reactive el GC bajo otro en curso
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+def _loads_json(data):
+    """Parsea JSON desde una vista del mmap (orjson si está disponible)"""
+    with gc_paused():
+        if orjson is not None:
+            return orjson.loads(data)
+        # json de la stdlib no acepta memoryview: decodificar directamente desde
+        # la vista evita la copia intermedia a bytes
+        return json.loads(str(data, 'utf-8'))
+
+def read_header(mm):
+    """Lee header HNFv9 (64 bytes)"""
+    (magic, version_major, version_minor, flags, block_count, header_size,
+     block_table_offset, manifest_offset, manifest_size, file_size,
+     checksum) = _HEADER.unpack_from(mm, 0)
     
     return {
         'magic': magic,
@@ -72,297 +182,317 @@ def read_header(f):
         'checksum': checksum,
     }
 
-def read_block_table(f):
+def read_block_table(mm):
     """Lee block table (16 x 32 bytes)"""
     blocks = []
-    for i in range(16):
-        data = f.read(32)
-        block_id = struct.unpack('<I', data[0:4])[0]
-        block_type = struct.unpack('<I', data[4:8])[0]
-        offset = struct.unpack('<Q', data[8:16])[0]
-        size = struct.unpack('<Q', data[16:24])[0]
-        checksum = struct.unpack('<Q', data[24:32])[0]
-        
-        blocks.append({
-            'id': block_id,
-            'type': block_type,
-            'name': BLOCK_NAMES[i],
-            'offset': offset,
-            'size': size,
-            'checksum': checksum,
-        })
+    with memoryview(mm)[HEADER_SIZE:HEADER_SIZE + BLOCK_COUNT * BLOCK_TABLE_ENTRY_SIZE] as raw:
+        for i, (block_id, block_type, offset, size, checksum) in enumerate(_BLOCK.iter_unpack(raw)):
+            blocks.append({
+                'id': block_id,
+                'type': block_type,
+                'name': BLOCK_NAMES[i],
+                'offset': offset,
+                'size': size,
+                'checksum': checksum,
+            })
     return blocks
 
-def read_manifest(f, offset, size):
+def read_manifest(mm, offset, size):
     """Lee manifest JSON"""
-    f.seek(offset)
-    data = f.read(size)
-    return json.loads(data.decode('utf-8'))
+    with memoryview(mm)[offset:offset + size] as data:
+        return _loads_json(data)
 
-def read_execution_hints(f, blocks):
+def read_execution_hints(mm, blocks):
     """Lee execution_hints (bloque 0xA)"""
     block = blocks[0xA]
     if block['size'] == 0:
         return None
     
-    f.seek(block['offset'])
-    data = f.read(block['size'])
-    return json.loads(data.decode('utf-8'))
+    with memoryview(mm)[block['offset']:block['offset'] + block['size']] as data:
+        return _loads_json(data)
 
 # ============================================================================
 # VALIDATION
 # ============================================================================
 
-def validate_hnf(path: str):
-    """Valida archivo HNF completo"""
+def format_hint_fields(cfg, fields, rope_fields, indent):
+    """Formatea los campos de una sección de execution_hints"""
+    lines = [f"{indent}✓ {k}: {cfg.get(k, 'N/A')}" for k in fields]
+    
+    if rope_fields and 'rope_scaling' in cfg:
+        rs = cfg['rope_scaling']
+        values = ", ".join(f"{k}={rs.get(k, 'N/A')}" for k in rope_fields if k != 'long_factor')
+        lines.append(f"{indent}✓ rope_scaling: {values}")
+        # long_factor solo se cuenta (puede tener cientos de valores)
+        if 'long_factor' in rope_fields and 'long_factor' in rs:
+            lines.append(f"{indent}✓ long_factor: [{len(rs['long_factor'])} values]")
+    return lines
+
+def flush_output(out):
+    """Vuelca las líneas acumuladas con una sola escritura"""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        out.clear()
+
+def print_summary(out, errors, warnings):
+    """Imprime el resumen final y devuelve True si no hay errores"""
+    out.append("\n" + "═" * 70)
+    if errors:
+        out.append("  ✗ VALIDATION FAILED")
+        for e in errors:
+            out.append(f"    ERROR: {e}")
+    elif warnings:
+        out.append("  ⚠ VALIDATION PASSED WITH WARNINGS")
+        for w in warnings:
+            out.append(f"    WARNING: {w}")
+    else:
+        out.append("  ✓ VALIDATION PASSED")
+    out.append("═" * 70)
+    flush_output(out)
     
-    print("═" * 70)
-    print(f"  HELIOS HNF VALIDATOR v9.0.5")
-    print("═" * 70)
-    print(f"  File: {path}")
-    print(f"  Size: {Path(path).stat().st_size / 1024 / 1024:.1f} MB")
-    print("═" * 70)
+    return len(errors) == 0
+
+def validate_hnf(path: str, verify_checksums: bool = True):
+    """Valida archivo HNF completo"""
     
     errors = []
     warnings = []
+    out = []
     
     with open(path, 'rb') as f:
-        # ════════════════════════════════════════════════════════════════
-        # HEADER
-        # ════════════════════════════════════════════════════════════════
-        print("\n[HEADER]")
-        header = read_header(f)
-        
-        # Validar magic
-        if header['magic'] != MAGIC:
-            errors.append(f"Invalid magic: {header['magic']}")
-            print(f"  ✗ Magic: {header['magic']} (expected {MAGIC})")
-        else:
-            print(f"  ✓ Magic: {header['magic']}")
+        file_size = os.fstat(f.fileno()).st_size
         
-        print(f"  ✓ Version: {header['version']}")
-        print(f"  ✓ Flags: 0x{header['flags']:08X}")
-        print(f"  ✓ Blocks: {header['block_count']}")
-        print(f"  ✓ Manifest: offset={header['manifest_offset']}, size={header['manifest_size']}")
+        out.append("═" * 70)
+        out.append(f"  HELIOS HNF VALIDATOR v9.0.5")
+        out.append("═" * 70)
+        out.append(f"  File: {path}")
+        out.append(f"  Size: {file_size / 1024 / 1024:.1f} MB")
+        out.append("═" * 70)
         
         # ════════════════════════════════════════════════════════════════
-        # BLOCK TABLE
-        # ════════════════════════════════════════════════════════════════
-        print("\n[BLOCK TABLE]")
-        blocks = read_block_table(f)
-        
-        active_blocks = []
-        for b in blocks:
-            if b['size'] > 0:
-                active_blocks.append(b)
-                size_mb = b['size'] / 1024 / 1024
-                print(f"  ✓ [{b['id']:X}] {b['name']:15} : {size_mb:8.2f} MB @ offset {b['offset']}")
-        
-        if not active_blocks:
-            errors.append("No active blocks found")
-        
-        # ════════════════════════════════════════════════════════════════
-        # EXECUTION HINTS
-        # ════════════════════════════════════════════════════════════════
-        print("\n[EXECUTION HINTS]")
-        hints = read_execution_hints(f, blocks)
-        
-        if hints is None:
-            warnings.append("No execution_hints block")
-            print("  ⚠ No execution_hints found")
-        else:
-            # v9.0.5: Verificar TEXT (ahora en sección separada)
-            if hints.get('text_enabled'):
-                print(f"\n  [TEXT CONFIG]")
-                tc = hints.get('text', {})
-                print(f"    ✓ arch: {tc.get('arch', 'N/A')}")
-                print(f"    ✓ num_hidden_layers: {tc.get('num_hidden_layers', 'N/A')}")
-                print(f"    ✓ hidden_size: {tc.get('hidden_size', 'N/A')}")
-                print(f"    ✓ vocab_size: {tc.get('vocab_size', 'N/A')}")
-                print(f"    ✓ attention_type: {tc.get('attention_type', 'N/A')}")
-                print(f"    ✓ qkv_layout: {tc.get('qkv_layout', 'N/A')}")
-                print(f"    ✓ mlp_type: {tc.get('mlp_type', 'N/A')}")
-                
-                if 'rope_scaling' in tc:
-                    rs = tc['rope_scaling']
-                    print(f"    ✓ rope_scaling: type={rs.get('type', 'N/A')}")
-            else:
-                # Fallback: hints en raíz (formato antiguo)
-                print(f"  ✓ arch: {hints.get('arch', 'N/A')}")
-                print(f"  ✓ num_hidden_layers: {hints.get('num_hidden_layers', 'N/A')}")
-                print(f"  ✓ hidden_size: {hints.get('hidden_size', 'N/A')}")
-                print(f"  ✓ vocab_size: {hints.get('vocab_size', 'N/A')}")
-                print(f"  ✓ attention_type: {hints.get('attention_type', 'N/A')}")
-                print(f"  ✓ qkv_layout: {hints.get('qkv_layout', 'N/A')}")
-                print(f"  ✓ mlp_type: {hints.get('mlp_type', 'N/A')}")
-                
-                if 'rope_scaling' in hints:
-                    rs = hints['rope_scaling']
-                    print(f"  ✓ rope_scaling: type={rs.get('type', 'N/A')}")
-            
-            # Verificar VISION
-            if hints.get('vision_enabled'):
-                print(f"\n  [VISION CONFIG]")
-                vc = hints.get('vision_config', {})
-                print(f"    ✓ arch: {vc.get('arch', 'N/A')}")
-                print(f"    ✓ image_size: {vc.get('image_size', 'N/A')}")
-                print(f"    ✓ patch_size: {vc.get('patch_size', 'N/A')}")
-            
-            # Verificar CORTEX
-            if hints.get('cortex_enabled'):
-                print(f"\n  [CORTEX CONFIG]")
-                cc = hints.get('cortex', {})
-                print(f"    ✓ arch: {cc.get('arch', 'N/A')}")
-                print(f"    ✓ num_hidden_layers: {cc.get('num_hidden_layers', 'N/A')}")
-                print(f"    ✓ hidden_size: {cc.get('hidden_size', 'N/A')}")
-                print(f"    ✓ vocab_size: {cc.get('vocab_size', 'N/A')}")
-                print(f"    ✓ qkv_layout: {cc.get('qkv_layout', 'N/A')}")
-                print(f"    ✓ mlp_type: {cc.get('mlp_type', 'N/A')}")
-                print(f"    ✓ partial_rotary_factor: {cc.get('partial_rotary_factor', 'N/A')}")
-                
-                if 'rope_scaling' in cc:
-                    rs = cc['rope_scaling']
-                    print(f"    ✓ rope_scaling: type={rs.get('type', 'N/A')}")
-                    if 'long_factor' in rs:
-                        print(f"    ✓ long_factor: [{len(rs['long_factor'])} values]")
-            
-            # Verificar CODE
-            if hints.get('code_enabled'):
-                print(f"\n  [CODE CONFIG]")
-                cc = hints.get('code', {})
-                print(f"    ✓ arch: {cc.get('arch', 'N/A')}")
-                print(f"    ✓ num_hidden_layers: {cc.get('num_hidden_layers', 'N/A')}")
-                print(f"    ✓ hidden_size: {cc.get('hidden_size', 'N/A')}")
-                print(f"    ✓ vocab_size: {cc.get('vocab_size', 'N/A')}")
-                
-                if 'rope_scaling' in cc:
-                    rs = cc['rope_scaling']
-                    print(f"    ✓ rope_scaling: type={rs.get('type', 'N/A')}, factor={rs.get('factor', 'N/A')}")
-        
-        # ════════════════════════════════════════════════════════════════
-        # MANIFEST (TENSORS)
+        # HEADER
         # ════════════════════════════════════════════════════════════════
-        print("\n[MANIFEST]")
-        manifest = read_manifest(f, header['manifest_offset'], header['manifest_size'])
-        
-        tensors = manifest.get('tensors', [])
-        print(f"  ✓ Total tensors: {len(tensors)}")
-        
-        # Contar por bloque
-        by_block = {}
-        for t in tensors:
-            block = t.get('block', 'unknown')
-            by_block[block] = by_block.get(block, 0) + 1
+        out.append("\n[HEADER]")
         
-        for block, count in sorted(by_block.items()):
-            print(f"    - {block}: {count} tensors")
+        # Header + block table deben existir antes de mapear (mmap no admite
+        # archivos vacíos y unpack falla con archivos truncados)
+        min_size = HEADER_SIZE + BLOCK_COUNT * BLOCK_TABLE_ENTRY_SIZE
+        if file_size < min_size:
+            errors.append(f"File too small: {file_size} bytes (header + block table need {min_size})")
+            out.append(f"  ✗ Size: {file_size} bytes (expected at least {min_size})")
+            return print_summary(out, errors, warnings)
         
-        # ════════════════════════════════════════════════════════════════
-        # PREFIX CHECK (v9.0.5: Todas las modalidades tienen prefijo)
-        # ════════════════════════════════════════════════════════════════
-        print("\n  [PREFIX CHECK]")
-        prefixes = {
-            'text_model': [],
-            'vision': [],
-            'cortex': [],
-            'code_exec': [],
-            'audio': [],
-        }
-        
-        for t in tensors:
-            name = t.get('name', '')
-            block = t.get('block', '')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+             ThreadPoolExecutor(max_workers=4) as pool:
+            # Sin checksums solo se leen header, block table, hints y manifest:
+            # desactivar el read-ahead para no traer los pesos intermedios
+            advise(mm, 'MADV_SEQUENTIAL' if verify_checksums else 'MADV_RANDOM')
             
-            if block in prefixes:
-                prefixes[block].append(name)
-        
-        # v9.0.5: Verificar que TEXT tiene prefijo text.
-        text_tensors = prefixes.get('text_model', [])
-        if text_tensors:
-            has_prefix = all(n.startswith('text.') for n in text_tensors)
-            sample = text_tensors[0] if text_tensors else 'N/A'
-            if has_prefix:
-                print(f"  ✓ TEXT: prefijo 'text.' OK (sample: {sample})")
-            else:
-                # Warning, no error - puede ser formato antiguo
-                warnings.append("TEXT tensors missing 'text.' prefix (old format?)")
-                print(f"  ⚠ TEXT: falta prefijo 'text.' (sample: {sample})")
-        
-        # Verificar que CORTEX tiene prefijo cortex.
-        cortex_tensors = prefixes.get('cortex', [])
-        if cortex_tensors:
-            has_prefix = all(n.startswith('cortex.') for n in cortex_tensors)
-            sample = cortex_tensors[0] if cortex_tensors else 'N/A'
-            if has_prefix:
-                print(f"  ✓ CORTEX: prefijo 'cortex.' OK (sample: {sample})")
-            else:
-                warnings.append("CORTEX tensors missing 'cortex.' prefix")
-                print(f"  ⚠ CORTEX: falta prefijo 'cortex.' (sample: {sample})")
-        
-        # Verificar que CODE tiene prefijo code.
-        code_tensors = prefixes.get('code_exec', [])
-        if code_tensors:
-            has_prefix = all(n.startswith('code.') for n in code_tensors)
-            sample = code_tensors[0] if code_tensors else 'N/A'
-            if has_prefix:
-                print(f"  ✓ CODE: prefijo 'code.' OK (sample: {sample})")
+            header = read_header(mm)
+            
+            # Validar magic
+            if header['magic'] != MAGIC:
+                errors.append(f"Invalid magic: {header['magic']}")
+                out.append(f"  ✗ Magic: {header['magic']} (expected {MAGIC})")
             else:
-                warnings.append("CODE tensors missing 'code.' prefix")
-                print(f"  ⚠ CODE: falta prefijo 'code.' (sample: {sample})")
-        
-        # Verificar que VISION tiene prefijo vision.
-        vision_tensors = prefixes.get('vision', [])
-        if vision_tensors:
-            has_prefix = all(n.startswith('vision.') for n in vision_tensors)
-            sample = vision_tensors[0] if vision_tensors else 'N/A'
-            if has_prefix:
-                print(f"  ✓ VISION: prefijo 'vision.' OK (sample: {sample})")
+                out.append(f"  ✓ Magic: {header['magic']}")
+            
+            out.append(f"  ✓ Version: {header['version']}")
+            out.append(f"  ✓ Flags: 0x{header['flags']:08X}")
+            out.append(f"  ✓ Blocks: {header['block_count']}")
+            
+            # Validar que el manifest cabe en el archivo antes de parsearlo
+            manifest_end = header['manifest_offset'] + header['manifest_size']
+            if manifest_end > file_size:
+                errors.append(f"Manifest out of bounds: ends at {manifest_end}, file size {file_size}")
+                out.append(f"  ✗ Manifest: offset={header['manifest_offset']}, size={header['manifest_size']} (file size {file_size})")
             else:
-                warnings.append("VISION tensors missing 'vision.' prefix")
-                print(f"  ⚠ VISION: falta prefijo 'vision.' (sample: {sample})")
-        
-        # Verificar que AUDIO tiene prefijo audio.
-        audio_tensors = prefixes.get('audio', [])
-        if audio_tensors:
-            has_prefix = all(n.startswith('audio.') for n in audio_tensors)
-            sample = audio_tensors[0] if audio_tensors else 'N/A'
-            if has_prefix:
-                print(f"  ✓ AUDIO: prefijo 'audio.' OK (sample: {sample})")
+                out.append(f"  ✓ Manifest: offset={header['manifest_offset']}, size={header['manifest_size']}")
+            
+            flush_output(out)
+            
+            # Header inválido: no tiene sentido recorrer bloques ni manifest
+            if errors:
+                return print_summary(out, errors, warnings)
+            
+            # ════════════════════════════════════════════════════════════════
+            # BLOCK TABLE
+            # ════════════════════════════════════════════════════════════════
+            out.append("\n[BLOCK TABLE]")
+            blocks = read_block_table(mm)
+            
+            active_count = 0
+            for b in blocks:
+                if b['size'] > 0:
+                    active_count += 1
+                    size_mb = b['size'] / 1024 / 1024
+                    out.append(f"  ✓ [{b['id']:X}] {b['name']:15} : {size_mb:8.2f} MB @ offset {b['offset']}")
+            
+            if active_count == 0:
+                errors.append("No active blocks found")
+            
+            # execution_hints se parsea entero: debe caber en el archivo
+            hb = blocks[0xA]
+            hints_end = hb['offset'] + hb['size']
+            if hb['size'] > 0 and hints_end > file_size:
+                errors.append(f"Execution hints out of bounds: ends at {hints_end}, file size {file_size}")
+                out.append(f"  ✗ [{hb['id']:X}] {hb['name']:15} : out of bounds (ends at {hints_end})")
+            
+            flush_output(out)
+            
+            if errors:
+                return print_summary(out, errors, warnings)
+            
+            advise(mm, 'MADV_WILLNEED', header['manifest_offset'], header['manifest_size'])
+            advise(mm, 'MADV_WILLNEED', blocks[0xA]['offset'], blocks[0xA]['size'])
+            
+            # El resto es independiente por bloque: XXH3 libera el GIL, así que
+            # los checksums se solapan con el parseo de hints y manifest.
+            # El pool es FIFO: el JSON va primero para no esperar a los hashes
+            manifest_future = pool.submit(read_manifest, mm, header['manifest_offset'], header['manifest_size'])
+            hints_future = pool.submit(read_execution_hints, mm, blocks)
+            
+            # No se hashean bloques fuera del archivo (sería un slice truncado)
+            # ni sin checksum registrado (0, igual que validate.rs)
+            checksum_jobs = []
+            if verify_checksums:
+                for b in blocks:
+                    if b['size'] == 0:
+                        continue
+                    if b['offset'] + b['size'] > file_size or b['checksum'] == 0:
+                        checksum_jobs.append((b, None))
+                    elif xxhash is not None:
+                        checksum_jobs.append((b, pool.submit(block_xxh3, mm, b)))
+            
+            # ════════════════════════════════════════════════════════════════
+            # CHECKSUMS
+            # ════════════════════════════════════════════════════════════════
+            if verify_checksums:
+                out.append("\n[CHECKSUMS]")
+                crc = header_crc32(mm)
+                if crc != header['checksum']:
+                    errors.append(f"Header checksum mismatch: 0x{crc:08X} != 0x{header['checksum']:08X}")
+                    out.append(f"  ✗ Header CRC32: 0x{crc:08X} (expected 0x{header['checksum']:08X})")
+                else:
+                    out.append(f"  ✓ Header CRC32: 0x{crc:08X}")
+            
+                if xxhash is None:
+                    out.append("  - Block XXH3-64: skipped (pip install xxhash)")
+                
+                for b, future in checksum_jobs:
+                    if future is None:
+                        block_end = b['offset'] + b['size']
+                        if block_end > file_size:
+                            errors.append(f"Block {b['name']} out of bounds: ends at {block_end}, file size {file_size}")
+                            out.append(f"  ✗ [{b['id']:X}] {b['name']:15} : out of bounds (ends at {block_end})")
+                        else:
+                            out.append(f"  - [{b['id']:X}] {b['name']:15} : no checksum")
+                        continue
+                    
+                    digest = future.result()
+                    if digest != b['checksum']:
+                        errors.append(f"Block {b['name']} checksum mismatch")
+                        out.append(f"  ✗ [{b['id']:X}] {b['name']:15} : 0x{digest:016X} (expected 0x{b['checksum']:016X})")
+                    else:
+                        out.append(f"  ✓ [{b['id']:X}] {b['name']:15} : 0x{digest:016X}")
+            
+                flush_output(out)
+            
+            # ════════════════════════════════════════════════════════════════
+            # EXECUTION HINTS
+            # ════════════════════════════════════════════════════════════════
+            out.append("\n[EXECUTION HINTS]")
+            hints = hints_future.result()
+            
+            if hints is None:
+                warnings.append("No execution_hints block")
+                out.append("  ⚠ No execution_hints found")
             else:
-                warnings.append("AUDIO tensors missing 'audio.' prefix")
-                print(f"  ⚠ AUDIO: falta prefijo 'audio.' (sample: {sample})")
-        
-        # ════════════════════════════════════════════════════════════════
-        # SUMMARY
-        # ════════════════════════════════════════════════════════════════
-        print("\n" + "═" * 70)
-        if errors:
-            print("  ✗ VALIDATION FAILED")
-            for e in errors:
-                print(f"    ERROR: {e}")
-        elif warnings:
-            print("  ⚠ VALIDATION PASSED WITH WARNINGS")
-            for w in warnings:
-                print(f"    WARNING: {w}")
-        else:
-            print("  ✓ VALIDATION PASSED")
-        print("═" * 70)
-        
-        return len(errors) == 0
+                for title, flag, key, fields, rope_fields in HINT_SECTIONS:
+                    if hints.get(flag):
+                        lines = [f"\n  [{title} CONFIG]"]
+                        lines += format_hint_fields(hints.get(key, {}), fields, rope_fields, "    ")
+                    elif title == "TEXT":
+                        # Fallback: hints en raíz (formato antiguo)
+                        lines = format_hint_fields(hints, fields, rope_fields, "  ")
+                    else:
+                        continue
+                    out.extend(lines)
+            
+            flush_output(out)
+            
+            # ════════════════════════════════════════════════════════════════
+            # MANIFEST (TENSORS)
+            # ════════════════════════════════════════════════════════════════
+            out.append("\n[MANIFEST]")
+            manifest = manifest_future.result()
+            
+            tensors = manifest.get('tensors', [])
+            out.append(f"  ✓ Total tensors: {len(tensors)}")
+            
+            # Contar por bloque
+            by_block = Counter(t.get('block', 'unknown') for t in tensors)
+            
+            for block, count in sorted(by_block.items()):
+                out.append(f"    - {block}: {count} tensors")
+            
+            # ════════════════════════════════════════════════════════════════
+            # PREFIX CHECK (v9.0.5: Todas las modalidades tienen prefijo)
+            # ════════════════════════════════════════════════════════════════
+            out.append("\n  [PREFIX CHECK]")
+            # Por bloque: [prefijo OK, primer nombre, nº de tensores]
+            status = {block: [True, None, 0] for block in BLOCK_PREFIXES}
+            
+            for t in tensors:
+                block = t.get('block', '')
+                if block not in BLOCKS_WITH_PREFIX:
+                    continue
+            
+                s = status[block]
+                name = t.get('name', '')
+                if s[2] == 0:
+                    s[1] = name
+                s[2] += 1
+                if s[0] and not name.startswith(BLOCK_PREFIXES[block]):
+                    s[0] = False
+            
+            for block, prefix in BLOCK_PREFIXES.items():
+                has_prefix, sample, count = status[block]
+                if count == 0:
+                    continue
+            
+                label = prefix[:-1].upper()
+                if has_prefix:
+                    out.append(f"  ✓ {label}: prefijo '{prefix}' OK (sample: {sample})")
+                elif block == 'text_model':
+                    # Warning, no error - puede ser formato antiguo
+                    warnings.append(f"{label} tensors missing '{prefix}' prefix (old format?)")
+                    out.append(f"  ⚠ {label}: falta prefijo '{prefix}' (sample: {sample})")
+                else:
+                    warnings.append(f"{label} tensors missing '{prefix}' prefix")
+                    out.append(f"  ⚠ {label}: falta prefijo '{prefix}' (sample: {sample})")
+            
+            flush_output(out)
+            
+            return print_summary(out, errors, warnings)
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python validate_hnf.py <file.hnf>")
+    args = sys.argv[1:]
+    verify_checksums = "--no-checksums" not in args
+    if not verify_checksums:
+        args = [a for a in args if a != "--no-checksums"]
+    if not args:
+        print("Usage: python validate_hnf.py <file.hnf> [--no-checksums]")
         sys.exit(1)
     
-    path = sys.argv[1]
+    path = args[0]
     if not Path(path).exists():
         print(f"Error: File not found: {path}")
         sys.exit(1)
     
-    success = validate_hnf(path)
+    success = validate_hnf(path, verify_checksums=verify_checksums)
     sys.exit(0 if success else 1)